@@ -0,0 +1,225 @@
+import asyncio
+import math
+import random
+import secrets
+import time
+
+import httpx
+
+from risk_index import DECISION_BANDS
+
+# In-process diagnostics: requests go straight into the ASGI app instead of
+# over the network, so a single worker can audit itself without deadlocking.
+
+DEFAULT_ASSET_ID = 12345
+DEFAULT_WALLET_MIX = ["STU_0", "STU_1", "MULE_0", "HUB_COLLECTOR_01", "GOVT_SCHOLARSHIP_DEPT"]
+
+# Marks requests made by the in-process client. The token is generated per
+# process and never leaves it, so outside callers cannot opt out of freezes.
+DIAGNOSTIC_HEADER = "X-Diagnostic-Token"
+_DIAGNOSTIC_TOKEN = secrets.token_hex(16)
+
+# Responses round risk_score to 4 decimals
+SCORE_TOLERANCE = 0.5e-4
+
+def is_diagnostic_request(request) -> bool:
+    return secrets.compare_digest(request.headers.get(DIAGNOSTIC_HEADER, ""), _DIAGNOSTIC_TOKEN)
+
+async def _analyze(client, wallet, asset_id=DEFAULT_ASSET_ID):
+    return await client.post("/analyze-wallet", json={"wallet_address": wallet, "asset_id": asset_id})
+
+class CheckFailed(Exception):
+    """A diagnostic check saw a response it did not expect."""
+
+def _expect(response, status_code):
+    if response.status_code != status_code:
+        raise CheckFailed(f"expected HTTP {status_code}, got {response.status_code}: {response.text[:200]}")
+    return response.json()
+
+# --- 1. The Checks (mirrors test_endpoints.py) ---
+
+async def check_health(client):
+    body = _expect(await client.get("/health"), 200)
+    if body["status"] != "running":
+        raise CheckFailed(f"unexpected status {body['status']!r}")
+    return body
+
+async def check_normal_wallet(client):
+    body = _expect(await _analyze(client, "STU_0"), 200)
+    if not 0.0 <= body["risk_score"] <= 1.0:
+        raise CheckFailed(f"risk_score out of range: {body['risk_score']}")
+    return {"risk_score": body["risk_score"], "decision": body["decision"]}
+
+async def check_mule_wallet(client):
+    body = _expect(await _analyze(client, "MULE_0"), 200)
+    if body["decision"] not in DECISION_BANDS:
+        raise CheckFailed(f"unknown decision {body['decision']!r}")
+    return {"risk_score": body["risk_score"], "decision": body["decision"]}
+
+async def check_hub_wallet(client):
+    body = _expect(await _analyze(client, "HUB_COLLECTOR_01"), 200)
+    return {"risk_score": body["risk_score"], "decision": body["decision"]}
+
+async def check_unknown_wallet(client):
+    _expect(await _analyze(client, "UNKNOWN_WALLET_XYZ"), 404)
+    return {"rejected": True}
+
+async def check_invalid_payload(client):
+    _expect(await client.post("/analyze-wallet", json={"wallet_address": "STU_0"}), 422)
+    return {"rejected": True}
+
+async def check_multiple_assets(client):
+    first, second = await asyncio.gather(_analyze(client, "STU_1", 100), _analyze(client, "STU_1", 200))
+    scores = [_expect(first, 200)["risk_score"], _expect(second, 200)["risk_score"]]
+    if scores[0] != scores[1]:
+        raise CheckFailed(f"score changed with asset id: {scores}")
+    return {"risk_score": scores[0], "assets": [100, 200]}
+
+async def check_government_wallet(client):
+    body = _expect(await _analyze(client, "GOVT_SCHOLARSHIP_DEPT"), 200)
+    return {"risk_score": body["risk_score"], "decision": body["decision"]}
+
+async def check_risk_thresholds(client):
+    wallets = ["STU_0", "MULE_0"]
+    responses = await asyncio.gather(*(_analyze(client, wallet) for wallet in wallets))
+    results = {}
+    for wallet, response in zip(wallets, responses):
+        body = _expect(response, 200)
+        if body["decision"] not in DECISION_BANDS:
+            raise CheckFailed(f"{wallet}: unknown decision {body['decision']!r}")
+        lower, upper = DECISION_BANDS[body["decision"]]
+        if not lower - SCORE_TOLERANCE <= body["risk_score"] <= upper + SCORE_TOLERANCE:
+            raise CheckFailed(f"{wallet}: decision {body['decision']} does not match score {body['risk_score']}")
+        results[wallet] = {"risk_score": body["risk_score"], "decision": body["decision"]}
+    return results
+
+async def check_top_risk_pagination(client):
+    full = _expect(await client.get("/top-risk", params={"limit": 1000}), 200)
+    first, second = await asyncio.gather(
+        client.get("/top-risk", params={"limit": 3}),
+        client.get("/top-risk", params={"limit": 3, "offset": 3}),
+    )
+    paged = _expect(first, 200)["wallets"] + _expect(second, 200)["wallets"]
+    if paged != full["wallets"][:6]:
+        raise CheckFailed("pages do not match the unpaged ranking")
+    scores = [w["risk_score"] for w in full["wallets"]]
+    if scores != sorted(scores, reverse=True):
+        raise CheckFailed("wallets not ordered by descending risk")
+    if full["total"] != sum(full["band_counts"].values()):
+        raise CheckFailed("band counts do not add up to total")
+    _expect(await client.get("/top-risk", params={"decision": "NOT_A_BAND"}), 400)
+    return {"total": full["total"], "band_counts": full["band_counts"]}
+
+CHECKS = [
+    ("Health Check", check_health),
+    ("Normal Wallet", check_normal_wallet),
+    ("Mule Detection", check_mule_wallet),
+    ("Hub Analysis", check_hub_wallet),
+    ("Unknown Wallet", check_unknown_wallet),
+    ("Payload Validation", check_invalid_payload),
+    ("Asset Multi-check", check_multiple_assets),
+    ("Gov Account", check_government_wallet),
+    ("Risk Thresholds", check_risk_thresholds),
+    ("Top-Risk Pagination", check_top_risk_pagination),
+]
+
+# --- 2. Runners ---
+
+def _client(app):
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://diagnostics",
+        headers={DIAGNOSTIC_HEADER: _DIAGNOSTIC_TOKEN},
+    )
+
+async def _run_check(client, name, check):
+    start = time.perf_counter()
+    try:
+        detail = await check(client)
+        result = {"name": name, "passed": True, "detail": detail}
+    except CheckFailed as e:
+        result = {"name": name, "passed": False, "error": str(e)}
+    except Exception as e:
+        # Transport errors, malformed JSON, missing fields
+        result = {"name": name, "passed": False, "error": f"{type(e).__name__}: {e}"}
+    result["duration_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+async def run_self_test(app):
+    """Runs every check concurrently against the app and returns per-check results."""
+    start = time.perf_counter()
+    async with _client(app) as client:
+        checks = await asyncio.gather(*(_run_check(client, name, check) for name, check in CHECKS))
+    passed = sum(1 for c in checks if c["passed"])
+    return {
+        "status": "success" if passed == len(checks) else "failed",
+        "passed": passed,
+        "total": len(checks),
+        "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+        "checks": checks,
+    }
+
+def _percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+async def run_load_test(app, concurrency=8, duration=5.0, wallets=None, asset_id=DEFAULT_ASSET_ID):
+    """Hammers /analyze-wallet with `concurrency` workers for `duration` seconds.
+
+    Workers are coroutines on the serving loop; inference itself runs in the
+    shared threadpool, so live traffic keeps being served meanwhile. Only 2xx
+    responses count toward latency and throughput; anything else is an error.
+    """
+    wallets = wallets or DEFAULT_WALLET_MIX
+    latencies = []
+    status_counts = {}
+    errors = 0
+
+    async def worker(client, deadline):
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                response = await _analyze(client, random.choice(wallets), asset_id)
+            except Exception:
+                errors += 1
+                continue
+            key = str(response.status_code)
+            status_counts[key] = status_counts.get(key, 0) + 1
+            if response.is_success:
+                latencies.append((time.perf_counter() - start) * 1000)
+            else:
+                errors += 1
+
+    async with _client(app) as client:
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(worker(client, deadline) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "measures": (
+            "Successful (2xx) in-process round trips to /analyze-wallet: routing, validation, "
+            "threadpool queueing and full-graph inference. No network or HTTP parsing; shares "
+            "the process with live traffic."
+        ),
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 3),
+        "wallets": wallets,
+        "requests": len(latencies) + errors,
+        "succeeded": len(latencies),
+        "errors": errors,
+        "status_counts": status_counts,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "min": round(latencies[0], 2) if latencies else None,
+            "p50": round(_percentile(latencies, 50), 2) if latencies else None,
+            "p90": round(_percentile(latencies, 90), 2) if latencies else None,
+            "p99": round(_percentile(latencies, 99), 2) if latencies else None,
+            "max": round(latencies[-1], 2) if latencies else None,
+        },
+    }
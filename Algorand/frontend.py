@@ -109,45 +109,65 @@ st.divider()
 
 st.header("🛠️ Diagnostic Control Center")
 
+with st.expander("⚙️ Load-Test Profile (optional)"):
+    run_load = st.checkbox("Include load test", value=False)
+    lt_concurrency = st.slider("Concurrent workers", 1, 32, 8)
+    lt_duration = st.slider("Duration (seconds)", 1, 60, 5)
+    lt_wallets = st.text_input("Wallet mix (comma-separated)", "STU_0,STU_1,MULE_0,HUB_COLLECTOR_01,GOVT_SCHOLARSHIP_DEPT")
+
 if st.button("🚀 Run Full System Audit"):
     status_box = st.empty()
-    status_box.info("Initiating 9-point security audit...")
+    status_box.info("Initiating full security audit...")
     
+    params = {}
+    if run_load:
+        params = {
+            "profile": "load",
+            "concurrency": lt_concurrency,
+            "duration": lt_duration,
+            "wallets": lt_wallets,
+        }
+
     try:
-        response = requests.get("http://localhost:8000/run-tests")
+        response = requests.get(f"{API_URL}/run-tests", params=params, timeout=lt_duration + 60)
         data = response.json()
-        output = data["stdout"]
+        if response.status_code != 200:
+            raise RuntimeError(data.get("detail", response.text))
 
         # 1. Summary Metrics
         col1, col2 = st.columns(2)
-        if "✅ ALL TESTS COMPLETED" in output:
+        if data["status"] == "success":
             col1.metric("Audit Status", "PASSED", delta="Green")
             status_box.success("System integrity verified.")
         else:
             col1.metric("Audit Status", "FAILED", delta="-Critical", delta_color="inverse")
             status_box.error("Audit failed. Review security logs below.")
-        
-        # 2. Detailed Test Breakdown (parsing the output)
-        st.subheader("Audit Logs")
-        
-        # We use an expander so the UI stays clean but "more info" is one click away
-        with st.expander("📄 View Detailed Console Trace", expanded=True):
-            st.code(output, language="text")
+        col2.metric("Checks Passed", f"{data['passed']}/{data['total']}", delta=f"{data['duration_ms']} ms", delta_color="off")
 
-        # 3. Quick-View Status List
+        # 2. Quick-View Status List
         st.markdown("### Quick Check")
-        test_names = [
-            "Health Check", "Normal Wallet", "Mule Detection", 
-            "Hub Analysis", "Unknown Wallet", "Payload Validation",
-            "Asset Multi-check", "Gov Account", "Risk Thresholds"
-        ]
-        
-        # Display a status list based on keywords in the output
-        for name in test_names:
-            if name in output or name.lower().replace(" ", "_") in output:
-                st.write(f"✔️ {name}")
+        for check in data["checks"]:
+            if check["passed"]:
+                st.write(f"✔️ {check['name']} ({check['duration_ms']} ms)")
             else:
-                st.write(f"⚪ {name} (Not detected in logs)")
+                st.write(f"❌ {check['name']} ({check['duration_ms']} ms): {check['error']}")
+
+        # 3. Detailed per-check results
+        with st.expander("📄 View Detailed Check Results"):
+            st.json(data["checks"])
+
+        # 4. Load-Test Report
+        if "load_test" in data:
+            lt = data["load_test"]
+            st.subheader("Load-Test Report")
+            m1, m2, m3, m4 = st.columns(4)
+            m1.metric("Throughput", f"{lt['throughput_rps']} req/s")
+            m2.metric("Succeeded", f"{lt['succeeded']}/{lt['requests']}")
+            m3.metric("p50 Latency", f"{lt['latency_ms']['p50']} ms")
+            m4.metric("p99 Latency", f"{lt['latency_ms']['p99']} ms")
+            st.bar_chart(pd.Series(lt["latency_ms"], name="Latency (ms)"))
+            st.caption(f"{lt['concurrency']} workers for {lt['duration_s']}s | Status codes: {lt['status_counts']} | Errors: {lt['errors']}")
+            st.caption(lt["measures"])
 
     except Exception as e:
         st.error(f"Connection Error: {e}")
@@ -1,12 +1,16 @@
 import torch
 import pickle
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+import asyncio
+import contextlib
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from algosdk.v2client import indexer
 from torch_geometric.nn import SAGEConv
 import torch.nn.functional as F
-import subprocess
-import sys
+from typing import Optional
+from risk_index import RiskIndex, DECISION_BANDS, classify
+import diagnostics
 # --- 1. Model Definition (Must match training architecture) ---
 class FraudGNN(torch.nn.Module):
     def __init__(self, in_channels=5, hidden_channels=16):
@@ -26,6 +30,9 @@ app = FastAPI(title="Algorand AI Fraud Detection Service")
 # Global state to hold model, mapping, and the full graph context
 state = {}
 
+# Only one /run-tests load profile may run at a time
+load_test_lock = asyncio.Lock()
+
 @app.on_event("startup")
 def load_resources():
     try:
@@ -45,6 +52,17 @@ def load_resources():
         # This prevents the "All 1.0" risk score by providing real neighbor data
         from train import create_graph_data
         state["full_graph_data"], _ = create_graph_data("algorand_fraud_dataset.csv")
+
+        # Seed the score-ordered index with one full-graph pass so /top-risk
+        # never has to run inference per wallet
+        state["risk_index"] = RiskIndex()
+        with torch.no_grad():
+            full_data = state["full_graph_data"]
+            probs = torch.exp(state["model"](full_data.x, full_data.edge_index))
+        wallets = state["encoder"].classes_
+        state["risk_index"].bulk_update(
+            {wallet: float(probs[idx][1]) for idx, wallet in enumerate(wallets)}
+        )
         
         print("✅ AI Resources and Graph Context Loaded Successfully.")
     except Exception as e:
@@ -62,6 +80,16 @@ def trigger_blockchain_freeze(wallet: str, asset_id: int):
     """Background Task: Triggers an asset freeze on the Algorand blockchain."""
     print(f"!!! BLOCKCHAIN ACTION: Freezing Asset {asset_id} for wallet {wallet} !!!")
 
+def score_wallet(wallet_idx: int) -> float:
+    """Runs full-graph inference and returns the fraud probability for one wallet."""
+    full_data = state["full_graph_data"]
+    with torch.no_grad():
+        # The model analyzes the node within the context of the entire network
+        output = state["model"](full_data.x, full_data.edge_index)
+        probs = torch.exp(output)
+    # Extract the fraud probability (Class 1) for this specific wallet
+    return float(probs[wallet_idx][1])
+
 # --- 5. API Endpoints ---
 
 @app.get("/")
@@ -74,7 +102,7 @@ def health():
     return {"status": "running", "network": "Algorand Testnet"}
 
 @app.post("/analyze-wallet")
-async def analyze_wallet(data: FraudCheck, background_tasks: BackgroundTasks):
+async def analyze_wallet(data: FraudCheck, background_tasks: BackgroundTasks, request: Request):
     # Step A: Check if encoder exists
     if state.get("encoder") is None:
         raise HTTPException(status_code=503, detail="Model encoder not ready.")
@@ -87,24 +115,20 @@ async def analyze_wallet(data: FraudCheck, background_tasks: BackgroundTasks):
         raise HTTPException(status_code=404, detail="Wallet address not found in historical graph data.")
 
     try:
-        # Step C: Run AI Inference using the full trained graph context
-        full_data = state["full_graph_data"]
-        
-        with torch.no_grad():
-            # The model analyzes the node within the context of the entire network
-            output = state["model"](full_data.x, full_data.edge_index)
-            probs = torch.exp(output)
-            
-            # Extract the fraud probability (Class 1) for this specific wallet
-            risk_score = float(probs[wallet_idx][1])
+        # Step C: Run AI Inference in a worker thread so the event loop keeps serving
+        risk_score = await run_in_threadpool(score_wallet, wallet_idx)
+
+        # Diagnostic traffic from /run-tests must not freeze assets or touch the index
+        is_diagnostic = diagnostics.is_diagnostic_request(request)
 
         # Step D: Determine Action
-        decision = "CLEAR"
-        if risk_score > 0.85:
-            decision = "FRAUD_HIGH"
+        decision = classify(risk_score)
+        if decision == "FRAUD_HIGH" and not is_diagnostic:
             background_tasks.add_task(trigger_blockchain_freeze, data.wallet_address, data.asset_id)
-        elif risk_score > 0.60:
-            decision = "SUSPICIOUS_REVIEW"
+
+        # Step E: Keep the top-risk index in step with the latest score
+        if state.get("risk_index") is not None and not is_diagnostic:
+            state["risk_index"].update(data.wallet_address, risk_score, data.asset_id)
 
         return {
             "address": data.wallet_address,
@@ -116,35 +140,88 @@ async def analyze_wallet(data: FraudCheck, background_tasks: BackgroundTasks):
     except Exception as e:
         # Handles unforeseen server-side errors
         raise HTTPException(status_code=500, detail=f"Inference error: {str(e)}")
+
+@app.get("/top-risk")
+def top_risk(
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    decision: Optional[str] = None,
+    asset_id: Optional[int] = None,
+    min_score: Optional[float] = Query(None, ge=0.0, le=1.0),
+    max_score: Optional[float] = Query(None, ge=0.0, le=1.0),
+):
+    """Riskiest wallets from the maintained score index, highest score first.
+
+    Score ranges are exclusive of min_score and inclusive of max_score, matching
+    the decision thresholds. asset_id restricts results to wallets analyzed for
+    that asset via /analyze-wallet since process start, ranked on their current
+    score.
+    """
+    if state.get("risk_index") is None:
+        raise HTTPException(status_code=503, detail="Risk index not ready.")
+    if decision is not None and decision not in DECISION_BANDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown decision '{decision}'. Expected one of: {', '.join(DECISION_BANDS)}."
+        )
+
+    total, wallets, band_counts = state["risk_index"].query(
+        limit=limit, offset=offset, decision=decision,
+        asset_id=asset_id, min_score=min_score, max_score=max_score
+    )
+    return {
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+        "wallets": wallets,
+        "band_counts": band_counts,
+    }
     
 
 
 
 
 @app.get("/run-tests")
-def run_tests():
-    try:
-        # Use env to force UTF-8 for the subprocess
-        import os
-        env = os.environ.copy()
-        env["PYTHONIOENCODING"] = "utf-8"
-
-        result = subprocess.run(
-            [sys.executable, "test_endpoints.py"],
-            capture_output=True,
-            text=True,
-            timeout=30,
-            env=env, # Pass the UTF-8 environment variable
-            encoding="utf-8" # Explicitly decode the output as utf-8
-        )
-        
-        return {
-            "status": "success" if result.returncode == 0 else "failed",
-            "stdout": result.stdout,
-            "stderr": result.stderr
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Test execution error: {str(e)}")
+async def run_tests(
+    profile: str = Query("self-test", pattern="^(self-test|load)$"),
+    concurrency: int = Query(8, ge=1, le=32),
+    duration: float = Query(5.0, gt=0, le=60),
+    wallets: Optional[str] = None,
+    asset_id: int = diagnostics.DEFAULT_ASSET_ID,
+):
+    """In-process diagnostics: the nine endpoint checks, plus an optional load test.
+
+    profile=load additionally drives /analyze-wallet with `concurrency` workers for
+    `duration` seconds over a comma-separated `wallets` mix. Diagnostic requests
+    never trigger freezes or update the risk index. Only one load test runs at a
+    time (409 otherwise), so its 32-worker cap leaves part of the shared 40-thread
+    pool for live inference.
+    """
+    wallet_mix = [w.strip() for w in wallets.split(",") if w.strip()] if wallets else None
+    if profile == "load":
+        if load_test_lock.locked():
+            raise HTTPException(status_code=409, detail="A load test is already running.")
+        if wallet_mix and state.get("encoder") is not None:
+            unknown = sorted(set(wallet_mix) - set(state["encoder"].classes_))
+            if unknown:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Wallets not found in historical graph data: {', '.join(unknown)}."
+                )
+
+    # No await between the locked() check and acquiring the lock, so two calls cannot both pass
+    guard = load_test_lock if profile == "load" else contextlib.nullcontext()
+    async with guard:
+        try:
+            report = await diagnostics.run_self_test(app)
+            if profile == "load":
+                report["load_test"] = await diagnostics.run_load_test(
+                    app, concurrency=concurrency, duration=duration,
+                    wallets=wallet_mix, asset_id=asset_id
+                )
+            return report
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Test execution error: {str(e)}")
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,125 @@
+import bisect
+import threading
+
+# --- Decision Bands (shared with /analyze-wallet) ---
+HIGH_RISK_THRESHOLD = 0.85
+REVIEW_THRESHOLD = 0.60
+
+# Each band is a half-open score range (lower, upper]
+DECISION_BANDS = {
+    "FRAUD_HIGH": (HIGH_RISK_THRESHOLD, 1.0),
+    "SUSPICIOUS_REVIEW": (REVIEW_THRESHOLD, HIGH_RISK_THRESHOLD),
+    "CLEAR": (-1.0, REVIEW_THRESHOLD),
+}
+
+def classify(risk_score: float) -> str:
+    """Maps a fraud probability to its decision band."""
+    if risk_score > HIGH_RISK_THRESHOLD:
+        return "FRAUD_HIGH"
+    if risk_score > REVIEW_THRESHOLD:
+        return "SUSPICIOUS_REVIEW"
+    return "CLEAR"
+
+
+class _ScoreBook:
+    """Wallet scores kept sorted by descending risk.
+
+    Keys are (-score, wallet) tuples so the list reads riskiest-first and
+    ties break on the address. Any score range maps to one contiguous slice.
+    """
+
+    def __init__(self):
+        self.keys = []
+        self.scores = {}
+
+    def set(self, wallet: str, score: float):
+        old = self.scores.get(wallet)
+        if old is not None:
+            if old == score:
+                return
+            del self.keys[bisect.bisect_left(self.keys, (-old, wallet))]
+        self.scores[wallet] = score
+        bisect.insort(self.keys, (-score, wallet))
+
+    def load(self, scores: dict):
+        """Merges many scores at once with a single sort instead of one insort each."""
+        self.scores.update(scores)
+        self.keys = sorted((-score, wallet) for wallet, score in self.scores.items())
+
+    def span(self, min_score=None, max_score=None):
+        """Returns the (start, stop) slice of keys with min_score < score <= max_score."""
+        start = 0 if max_score is None else bisect.bisect_left(self.keys, (-max_score,))
+        stop = len(self.keys) if min_score is None else bisect.bisect_left(self.keys, (-min_score,))
+        return start, max(start, stop)
+
+
+class RiskIndex:
+    """Score-ordered index over the latest risk score of every tracked wallet.
+
+    A global book holds one score per wallet. Each asset also gets a book,
+    holding the wallets analyzed for that asset since process start; every
+    score change is written to the global book and to each asset book that
+    holds the wallet, so all books rank on the same current score. Counts and
+    pages are bisections plus a slice, so they stay cheap as the table grows.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._global = _ScoreBook()
+        self._by_asset = {}
+        self._assets_of = {}
+
+    def _set(self, wallet, score):
+        self._global.set(wallet, score)
+        for asset_id in self._assets_of.get(wallet, ()):
+            self._by_asset[asset_id].set(wallet, score)
+
+    def update(self, wallet: str, score: float, asset_id: int = None):
+        with self._lock:
+            if asset_id is not None:
+                self._by_asset.setdefault(asset_id, _ScoreBook())
+                self._assets_of.setdefault(wallet, set()).add(asset_id)
+            self._set(wallet, score)
+
+    def bulk_update(self, scores: dict):
+        """Sets global scores without recording any asset membership."""
+        with self._lock:
+            self._global.load(scores)
+            for wallet, score in scores.items():
+                for asset_id in self._assets_of.get(wallet, ()):
+                    self._by_asset[asset_id].set(wallet, score)
+
+    def _book(self, asset_id):
+        if asset_id is None:
+            return self._global
+        return self._by_asset.get(asset_id, _ScoreBook())
+
+    @staticmethod
+    def _bounds(decision, min_score, max_score):
+        lower, upper = min_score, max_score
+        if decision is not None:
+            band_low, band_high = DECISION_BANDS[decision]
+            lower = band_low if lower is None else max(lower, band_low)
+            upper = band_high if upper is None else min(upper, band_high)
+        return lower, upper
+
+    def query(self, limit=100, offset=0, decision=None, asset_id=None, min_score=None, max_score=None):
+        """Returns (total, page, band_counts) from a single snapshot of the index.
+
+        page lists the riskiest matching wallets; band_counts covers the whole
+        asset scope, ignoring the decision and score filters.
+        """
+        lower, upper = self._bounds(decision, min_score, max_score)
+        with self._lock:
+            book = self._book(asset_id)
+            start, stop = book.span(lower, upper)
+            page = book.keys[start + offset:min(stop, start + offset + limit)]
+            band_counts = {}
+            for band, (band_low, band_high) in DECISION_BANDS.items():
+                band_start, band_stop = book.span(band_low, band_high)
+                band_counts[band] = band_stop - band_start
+        items = [
+            {"address": wallet, "risk_score": round(-neg, 4), "decision": classify(-neg)}
+            for neg, wallet in page
+        ]
+        return stop - start, items, band_counts
@@ -100,13 +100,26 @@ def test_high_risk_threshold():
         print(f"  {wallet}: {res['risk_score']} -> {res['decision']}")
     print("✓ PASSED")
 
+def test_top_risk_pagination():
+    """Test 10: Top-risk ranking and pagination"""
+    print("\n=== Test 10: Top-Risk Pagination ===")
+    full = requests.get(f"{BASE_URL}/top-risk", params={"limit": 1000}).json()
+    page_1 = requests.get(f"{BASE_URL}/top-risk", params={"limit": 3}).json()
+    page_2 = requests.get(f"{BASE_URL}/top-risk", params={"limit": 3, "offset": 3}).json()
+    assert page_1["wallets"] + page_2["wallets"] == full["wallets"][:6]
+    scores = [w["risk_score"] for w in full["wallets"]]
+    assert scores == sorted(scores, reverse=True)
+    assert full["total"] == sum(full["band_counts"].values())
+    print(f"Tracked wallets: {full['total']} {full['band_counts']}")
+    print("✓ PASSED")
+
 if __name__ == "__main__":
     print("=" * 60)
     print("ALGORAND FRAUD DETECTION API - FULL INTEGRATION TEST")
     print("=" * 60)
     
     try:
-        # EXECUTE ALL 9 TESTS
+        # EXECUTE ALL 10 TESTS
         test_health_endpoint()
         test_analyze_wallet_normal()
         test_analyze_wallet_mule()
@@ -116,6 +129,7 @@ if __name__ == "__main__":
         test_analyze_wallet_multiple_assets()
         test_government_wallet()
         test_high_risk_threshold()
+        test_top_risk_pagination()
         
         print("\n" + "=" * 60)
         print("✅ ALL TESTS COMPLETED SUCCESSFULLY")
@@ -0,0 +1,90 @@
+import sys
+import time
+
+from risk_index import RiskIndex
+
+# Offline checks for the /top-risk score index. No server or model needed:
+# run with `python test_risk_index.py` or `pytest test_risk_index.py`.
+
+def make_index():
+    # Scores pinned to the band edges
+    index = RiskIndex()
+    index.bulk_update({"EDGE_TOP": 1.0, "EDGE_HIGH": 0.85, "EDGE_REVIEW": 0.60, "EDGE_ZERO": 0.0, "MID": 0.7})
+    return index
+
+def test_band_boundaries():
+    """Test 1: Band edges are (lower, upper] like /analyze-wallet"""
+    print("\n=== Test 1: Band Boundaries ===")
+    total, page, bands = make_index().query()
+    assert total == 5
+    assert [w["address"] for w in page] == ["EDGE_TOP", "EDGE_HIGH", "MID", "EDGE_REVIEW", "EDGE_ZERO"]
+    assert [w["decision"] for w in page] == ["FRAUD_HIGH", "SUSPICIOUS_REVIEW", "SUSPICIOUS_REVIEW", "CLEAR", "CLEAR"]
+    assert bands == {"FRAUD_HIGH": 1, "SUSPICIOUS_REVIEW": 2, "CLEAR": 2}
+    assert make_index().query(decision="FRAUD_HIGH")[0] == 1
+    print("✓ PASSED")
+
+def test_score_ranges():
+    """Test 2: Range filters exclude min_score and include max_score"""
+    print("\n=== Test 2: Score Ranges ===")
+    index = make_index()
+    assert index.query(min_score=0.85, max_score=1.0)[0] == 1
+    assert index.query(min_score=0.6, max_score=0.85)[0] == 2
+    assert index.query(min_score=0.9, max_score=0.1)[0] == 0
+    assert index.query(decision="CLEAR", min_score=0.5)[0] == 1
+    print("✓ PASSED")
+
+def test_pagination():
+    """Test 3: Offset/limit slice the ranking"""
+    print("\n=== Test 3: Pagination ===")
+    index = make_index()
+    assert [w["address"] for w in index.query(limit=2, offset=1)[1]] == ["EDGE_HIGH", "MID"]
+    total, page, _ = index.query(offset=10)
+    assert total == 5 and page == []
+    assert [w["address"] for w in index.query(limit=10, offset=3)[1]] == ["EDGE_REVIEW", "EDGE_ZERO"]
+    print("✓ PASSED")
+
+def test_asset_books_follow_latest_score():
+    """Test 4: Asset filters rank on the wallet's current score"""
+    print("\n=== Test 4: Asset Books ===")
+    index = make_index()
+    index.update("MID", 0.9, asset_id=1)
+    index.update("MID", 0.5, asset_id=2)
+    assert index.query(asset_id=1)[1] == [{"address": "MID", "risk_score": 0.5, "decision": "CLEAR"}]
+    index.bulk_update({"MID": 0.95})
+    assert index.query(asset_id=2)[2]["FRAUD_HIGH"] == 1
+    assert index.query(asset_id=3)[0] == 0
+    print("✓ PASSED")
+
+def test_bulk_seed_scales():
+    """Test 5: Seeding a large table is a single sort"""
+    print("\n=== Test 5: Bulk Seed ===")
+    index = RiskIndex()
+    start = time.perf_counter()
+    index.bulk_update({f"W_{i}": (i * 7919 % 200_000) / 200_000 for i in range(200_000)})
+    elapsed = time.perf_counter() - start
+    print(f"Seeded 200k wallets in {elapsed:.2f}s")
+    total, page, _ = index.query(limit=3)
+    assert total == 200_000
+    scores = [w["risk_score"] for w in page]
+    assert scores == sorted(scores, reverse=True)
+    assert elapsed < 2.0
+    print("✓ PASSED")
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("RISK INDEX - OFFLINE TESTS")
+    print("=" * 60)
+
+    try:
+        test_band_boundaries()
+        test_score_ranges()
+        test_pagination()
+        test_asset_books_follow_latest_score()
+        test_bulk_seed_scales()
+
+        print("\n" + "=" * 60)
+        print("✅ ALL TESTS COMPLETED SUCCESSFULLY")
+        print("=" * 60)
+    except AssertionError as e:
+        print(f"\n❌ TEST SUITE FAILED AT: {e}")
+        sys.exit(1)